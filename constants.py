@@ -1,6 +1,8 @@
 # constants.py
 
 import os
+import pathlib
+from types import MappingProxyType
 
 # Application version
 
@@ -9,12 +11,16 @@ VERSION = "1.15.0"
 # File and directory paths
 CSV_FILE = "task_log.csv"
 CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".task_logger")
+EXPORTS_DIR = pathlib.Path("exports")
+
+# Format used for all stored task timestamps
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
 
 # Default settings
 DEFAULT_WINDOW_SIZE = "775x425"
 
-# UI Colors
-COLORS = {
+# UI Colors (read-only)
+COLORS = MappingProxyType({
     "primary": "#4287f5",      # Blue
     "secondary": "#f0f0f0",    # Light gray
     "success": "#4caf50",      # Green
@@ -26,4 +32,4 @@ COLORS = {
     "background": "#ffffff",   # White
     "sidebar": "#2c3e50",      # Dark blue-gray
     "sidebar_text": "#ecf0f1", # Almost white
-}
\ No newline at end of file
+})
\ No newline at end of file
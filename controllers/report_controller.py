@@ -1,11 +1,60 @@
 # controllers/report_controller.py
 
+import io
 import os
-import webbrowser
-import markdown
+import tempfile
+import numpy as np
 import pandas as pd
+
+# cmarkgfm renders markdown in C; fall back to the pure-Python parser if missing
+try:
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as cmarkgfmOptions
+except ImportError:
+    cmarkgfm = None
+
+from pandas.api.types import is_datetime64_any_dtype
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from constants import TIMESTAMP_FORMAT, EXPORTS_DIR
+
+# Single reusable file that previews are written to
+_PREVIEW_PATH = os.path.join(tempfile.gettempdir(), "task_logger_preview.html")
+
+# HTML page used to display rendered markdown previews
+_PREVIEW_HTML = """
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; color: #000; }}
+        h1 {{ color: #2c3e50; border-bottom: 2px solid #4287f5; padding-bottom: 10px; }}
+        h2 {{ color: #34495e; border-bottom: 1px solid #ddd; padding-bottom: 5px; margin-top: 30px; }}
+        h3 {{ color: #3498db; margin-top: 20px; margin-bottom: 10px; }}
+        ul {{ padding-left: 20px; margin-bottom: 0px  !important; }}
+        li {{ margin-bottom: 0px  !important; }}
+        .timestamp {{ color: #777; font-style: italic; }}
+        .note {{ background-color: #f8f9fa; padding: 5px 10px; border-left: 3px solid #4287f5; margin-top: 5px; }}
+    </style>
+</head>
+<body>
+    {body}
+</body>
+</html>
+"""
+
+# Weekly report returned when there are no tasks to list
+_EMPTY_REPORT_TEMPLATE = (
+    "📋 5-15\n\n"
+    "<strong>Name</strong>: [InsertName]<br><strong>Week Ending</strong>: {date}\n"
+    "### Accomplishments this week\n"
+    "*No completed tasks this week*\n\n"
+    "### Priorities next week\n"
+    "*No pending tasks for next week*\n\n"
+    "### Risks/Challenges\n"
+    "### Learnings, Opportunities, Feedback, or Observations"
+)
+
 class ReportController:
     """
     Controller for generating reports from task data
@@ -20,100 +69,140 @@ class ReportController:
         """
         self.model = task_model
         
-    def generate_markdown_content(self, days=7):
+        # Create the exports folder once so exports never hit a missing directory
+        EXPORTS_DIR.mkdir(exist_ok=True)
+        
+        # Rendered HTML of existing markdown files keyed by (path, size, mtime)
+        self._html_cache = {}
+        
+        # Last markdown listing of the exports folder, keyed by the folder's mtime
+        self._md_listing = None
+        
+        # Worker used to overlap file writes with markdown rendering
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        
+    def generate_markdown_content(self, days=7, now=None):
         """
         Generate markdown content for reports
         
         Args:
             days: Number of days to include in the report
+            now: Optional report time, defaults to the current time
             
         Returns:
             String containing markdown formatted report
         """
-        end_date = datetime.now()
+        buf = io.StringIO()
+        self._write_markdown_content(buf.write, days, now)
+        return buf.getvalue()
+    
+    def _write_markdown_content(self, w, days=7, now=None):
+        """
+        Write the markdown report piece by piece to a buffer or open file
+        
+        Args:
+            w: Write function the report is streamed to
+            days: Number of days to include in the report
+            now: Optional report time, defaults to the current time
+        """
+        # Read the clock once for the window and the week ending date
+        end_date = now or datetime.now()
         start_date = end_date - timedelta(days=days)
+        export_date = end_date.strftime("%Y-%m-%d")
+        
+        # Nothing to process on a fresh task log
+        if self.model.df.empty:
+            w(_EMPTY_REPORT_TEMPLATE.format(date=export_date))
+            return
         
-        # Create a temporary DataFrame for processing
-        temp_df = self.model.df.copy()
+        # Selecting the report columns already yields a new DataFrame, so no extra copy is needed
+        report_columns = ["Task Description", "Start Time", "Stop Time", "Updated", "Active", "Notes"]
+        temp_df = self.model.df[report_columns]
         
-        # Ensure relevant columns are converted to datetime
-        temp_df["Start Time"] = pd.to_datetime(temp_df["Start Time"], errors='coerce')
-        temp_df["Stop Time"] = pd.to_datetime(temp_df["Stop Time"], errors='coerce')
-        temp_df["Updated"] = pd.to_datetime(temp_df["Updated"], errors='coerce')  # Ensure Updated is datetime
+        # Ensure relevant columns are converted to datetime (no-op if already parsed)
+        for col in ["Start Time", "Stop Time", "Updated"]:
+            if not is_datetime64_any_dtype(temp_df[col]):
+                temp_df[col] = pd.to_datetime(temp_df[col], format=TIMESTAMP_FORMAT, errors='coerce')
         
-        # Sort the DataFrame by Start Time
-        temp_df = temp_df.sort_values(by="Start Time")
+        # Sort once by task then Start Time so each section is already grouped,
+        # and coerce missing notes to empty strings once
+        temp_df = temp_df.sort_values(by=["Task Description", "Start Time"])
+        temp_df["Notes"] = temp_df["Notes"].fillna("").astype(str)
         
-        # Create completed and in-progress task dataframes
-        completed_tasks = temp_df[temp_df["Active"] == 0]
-        pending_tasks = temp_df[temp_df["Active"] != 0]
+        # Create completed and in-progress task dataframes from one NumPy mask
+        active = temp_df["Active"].to_numpy() != 0
+        completed_tasks = temp_df.iloc[np.flatnonzero(~active)]
+        pending_tasks = temp_df.iloc[np.flatnonzero(active)]
 
         # Filter completed tasks within the last week by Updated or Start Time
-        completed_tasks = completed_tasks[
-            completed_tasks.apply(
-                lambda row: row["Updated"] if pd.notna(row["Updated"]) else row["Start Time"], axis=1
-            ).between(start_date, end_date)
-        ]
+        updated = completed_tasks["Updated"].to_numpy()
+        effective = np.where(np.isnat(updated), completed_tasks["Start Time"].to_numpy(), updated)
+        in_window = (effective >= np.datetime64(start_date)) & (effective <= np.datetime64(end_date))
+        completed_tasks = completed_tasks.iloc[in_window]
 
-        export_date = datetime.now().strftime("%Y-%m-%d")
-        lines = ["📋 5-15\n"]
-        lines.append(f"<strong>Name</strong>: [InsertName]<br><strong>Week Ending</strong>: {export_date}")
+        if completed_tasks.empty and pending_tasks.empty:
+            w(_EMPTY_REPORT_TEMPLATE.format(date=export_date))
+            return
+        
+        w("📋 5-15\n\n")
+        w("<strong>Name</strong>: [InsertName]<br><strong>Week Ending</strong>: ")
+        w(export_date)
+        w("\n")
         
         # Accomplishments section
-        lines.append("### Accomplishments this week")
+        w("### Accomplishments this week\n")
                 
         if not completed_tasks.empty:
-            # Group completed tasks by description
-            completed_grouped = completed_tasks.groupby("Task Description")
-            
-            for task, group in completed_grouped:
-                lines.append(f"- {task}")
-                
-                
-                for _, row in group.iterrows():
-                    note_text = str(row["Notes"]) if pd.notna(row["Notes"]) else ""
-                    
-                    # Split notes by the pipe delimiter
-                    individual_notes = note_text.split("|")
-                    
-                    # Add each note as a separate bullet point, stripping whitespace
-                    for note in individual_notes:
-                        if note.strip():  # Only add if note isn't empty after stripping
-                            lines.append(f"     - {note.strip()}")
-                
-                lines.append("")  # Add a blank line between task groups
+            self._write_task_sections(w, completed_tasks)
         else:
-            lines.append("*No completed tasks this week*\n")
+            w("*No completed tasks this week*\n\n")
         
         # Priorities section
-        lines.append("### Priorities next week")
+        w("### Priorities next week\n")
         
         if not pending_tasks.empty:
-            # Group pending tasks by description
-            pending_grouped = pending_tasks.groupby("Task Description")
-            
-            for task, group in pending_grouped:
-                lines.append(f"- {task}")
-                lines.append("")  # Add a blank line after the task heading
-                
-                for _, row in group.iterrows():
-                    note_text = str(row["Notes"]) if pd.notna(row["Notes"]) else ""
-                    
-                    # Split notes by the pipe delimiter
-                    individual_notes = note_text.split("|")
-                    
-                    # Add each note as a separate bullet point, stripping whitespace
-                    for note in individual_notes:
-                        if note.strip():  # Only add if note isn't empty after stripping
-                            lines.append(f"     - {note.strip()}")
-                
-                lines.append("")  # Add a blank line between task groups
+            self._write_task_sections(w, pending_tasks, blank_after_task=True)
         else:
-            lines.append("*No pending tasks for next week*\n")
+            w("*No pending tasks for next week*\n\n")
+        
+        w("### Risks/Challenges\n")
+        w("### Learnings, Opportunities, Feedback, or Observations")
+
+    def _write_task_sections(self, w, tasks, blank_after_task=False):
+        """
+        Write a bullet per task description followed by its notes
+        
+        Args:
+            w: Write function of the markdown buffer
+            tasks: DataFrame of tasks sorted by Task Description then Start Time, with string Notes
+            blank_after_task: Add a blank line after each task heading
+        """
+        # Rows without a description have no heading to go under, so leave them out
+        tasks = tasks[tasks["Task Description"].notna()]
+        if tasks.empty:
+            return
+        
+        # Split pipe-delimited notes into one stripped note per row in a single pass
+        notes = tasks["Notes"].str.split("|").explode().str.strip()
+        descriptions = tasks["Task Description"].loc[notes.index]
         
-        lines.append("### Risks/Challenges")
-        lines.append("### Learnings, Opportunities, Feedback, or Observations")
-        return "\n".join(lines)
+        last = None
+        for task, note in zip(descriptions.tolist(), notes.tolist()):
+            # Emit a heading whenever the task description changes
+            if task != last:
+                if last is not None:
+                    w("\n")  # Add a blank line between task groups
+                w(f"- {task}\n")
+                if blank_after_task:
+                    w("\n")
+                last = task
+            
+            if note:  # Only add if note isn't empty after stripping
+                w("     - ")
+                w(note)
+                w("\n")
+        
+        w("\n")  # Add a blank line after the last task group
     
     def preview_markdown(self):
         """
@@ -123,40 +212,16 @@ class ReportController:
             Tuple of (success, message or error)
         """
         try:
-            md_content = self.generate_markdown_content()
-            self.export_to_markdown()
+            now = datetime.now()
+            md_content = self.generate_markdown_content(now=now)
             
-            # Convert to HTML
-            html = markdown.markdown(md_content)
-        
-            # Save as temp HTML file
-            temp_html = f"exports/temp_preview_{datetime.now().strftime('%Y%m%d%H%M%S')}.html"
-            absolute_path = os.path.abspath(temp_html)
-            file_url = f"file://{absolute_path}"
-
-            with open(temp_html, "w", encoding="utf-8") as f:
-                f.write(f"""
-                <html>
-                <head>
-                    <style>
-                        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; color: #000; }}
-                        h1 {{ color: #2c3e50; border-bottom: 2px solid #4287f5; padding-bottom: 10px; }}
-                        h2 {{ color: #34495e; border-bottom: 1px solid #ddd; padding-bottom: 5px; margin-top: 30px; }}
-                        h3 {{ color: #3498db; margin-top: 20px; margin-bottom: 10px; }}
-                        ul {{ padding-left: 20px; }}
-                        li {{ margin-bottom: 10px; margin-bottom: 0 !important; }}
-                        .timestamp {{ color: #777; font-style: italic; }}
-                        .note {{ background-color: #f8f9fa; padding: 5px 10px; border-left: 3px solid #4287f5; margin-top: 5px; }}
-                    </style>
-                </head>
-                <body>
-                    {html}
-                </body>
-                </html>
-                """)
+            # Write the markdown export in the background while rendering HTML
+            export_future = self._executor.submit(self._write_markdown, md_content, now)
             
-            # Open in default browser
-            webbrowser.open(file_url)
+            # Convert to HTML
+            html = self._render_markdown(md_content)
+            temp_html = self._open_preview(html)
+            export_future.result()
             return True, f"Preview opened in browser: {temp_html}"
         except Exception as e:
             return False, f"Error generating preview: {str(e)}"
@@ -169,18 +234,45 @@ class ReportController:
             Tuple of (success, file path or error message)
         """
         try:
-            md_content = self.generate_markdown_content()
-            
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            output_path = f"exports/{date_str}_weekly_summary.md"
-            
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(md_content)
-            
+            # Stream the report straight into the file instead of building the whole string first
+            now = datetime.now()
+            output_path = self._weekly_summary_path(now)
+            with open(output_path, "w", encoding="utf-8", buffering=65536) as f:
+                self._write_markdown_content(f.write, now=now)
             return True, output_path
         except Exception as e:
             return False, f"Error exporting to markdown: {str(e)}"
 
+    def _write_markdown(self, md_content, now):
+        """
+        Write already generated markdown content to the weekly summary file
+        
+        Args:
+            md_content: Markdown formatted report
+            now: Time the report was generated at
+            
+        Returns:
+            Path of the written file
+        """
+        output_path = self._weekly_summary_path(now)
+        
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(md_content)
+        
+        return output_path
+
+    def _weekly_summary_path(self, now):
+        """
+        Build the export path of the weekly summary for a given day
+        
+        Args:
+            now: Time the report was generated at
+            
+        Returns:
+            Path of the weekly summary markdown file
+        """
+        return EXPORTS_DIR / f"{now:%Y-%m-%d}_weekly_summary.md"
+
 
     def list_markdown_files(self):
         """
@@ -190,17 +282,53 @@ class ReportController:
             List of markdown filenames in the exports folder
         """
         try:
-            # Get all files in the exports directory
-            files = os.listdir("exports")
-            print(f"Files in exports directory: {files}")
-            # Filter for markdown files only
-            md_files = [f for f in files if f.endswith('.md')]
-            print(f"Markdown files found: {md_files}")
-            return md_files
+            # Adding or removing files updates the folder mtime, so an unchanged
+            # mtime means the last scan is still valid
+            mtime = os.stat(EXPORTS_DIR).st_mtime_ns
+            if self._md_listing is not None and self._md_listing[0] == mtime:
+                return list(self._md_listing[1])
+            
+            # Scan the exports directory for markdown files only
+            with os.scandir(EXPORTS_DIR) as entries:
+                mds = [e.name for e in entries if e.is_file() and e.name.endswith('.md')]
+            self._md_listing = (mtime, mds)
+            return list(mds)
         except Exception as e:
             print(f"Error listing markdown files: {str(e)}")
             return []
 
+    def clear_previews(self):
+        """
+        Delete the preview HTML file, plus any HTML previews older versions left in the exports folder
+        
+        Returns:
+            Number of files deleted
+        """
+        paths = [_PREVIEW_PATH]
+        if os.path.isdir(EXPORTS_DIR):
+            paths += [os.path.join(EXPORTS_DIR, name) for name in os.listdir(EXPORTS_DIR) if name.endswith(".html")]
+        
+        cleared = 0
+        for path in paths:
+            if not os.path.isfile(path):
+                continue
+            try:
+                os.remove(path)
+                cleared += 1
+                print(f"Deleted {path}")
+            except Exception as e:
+                print(f"Error deleting {path}: {e}")
+        return cleared
+
+    def list_markdown_files_async(self):
+        """
+        List the markdown files in the exports folder on the worker thread
+        
+        Returns:
+            Future resolving to the list of markdown filenames
+        """
+        return self._executor.submit(self.list_markdown_files)
+
     def preview_existing_markdown(self, filename):
         """
         Preview an existing markdown file in browser
@@ -214,47 +342,68 @@ class ReportController:
         try:
             # Ensure the filename is just the basename, not a path
             basename = os.path.basename(filename)
-            file_path = os.path.join("exports", basename)
+            file_path = os.path.join(EXPORTS_DIR, basename)
             
             # Check if file exists
             if not os.path.isfile(file_path):
                 return False, f"File not found: {file_path}"
             
-            # Read markdown content
-            with open(file_path, "r", encoding="utf-8") as f:
-                md_content = f.read()
+            # Reuse the rendered HTML if the file is unchanged since last preview
+            st = os.stat(file_path)
+            key = (file_path, st.st_size, st.st_mtime)
+            html = self._html_cache.get(key)
             
-            # Convert to HTML
-            html = markdown.markdown(md_content)
-        
-            # Save as temp HTML file
-            temp_html = f"exports/temp_preview_{datetime.now().strftime('%Y%m%d%H%M%S')}.html"
-            absolute_path = os.path.abspath(temp_html)
-            file_url = f"file://{absolute_path}"
-
-            with open(temp_html, "w", encoding="utf-8") as f:
-                f.write(f"""
-                <html>
-                <head>
-                    <style>
-                        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; color: #000; }}
-                        h1 {{ color: #2c3e50; border-bottom: 2px solid #4287f5; padding-bottom: 10px; }}
-                        h2 {{ color: #34495e; border-bottom: 1px solid #ddd; padding-bottom: 5px; margin-top: 30px; }}
-                        h3 {{ color: #3498db; margin-top: 20px; margin-bottom: 10px; }}
-                        ul {{ padding-left: 20px; margin-bottom: 0px  !important; }}
-                        li {{ margin-bottom: 0px  !important; }}
-                        .timestamp {{ color: #777; font-style: italic; }}
-                        .note {{ background-color: #f8f9fa; padding: 5px 10px; border-left: 3px solid #4287f5; margin-top: 5px; }}
-                    </style>
-                </head>
-                <body>
-                    {html}
-                </body>
-                </html>
-                """)
+            if html is None:
+                # Read markdown content
+                with open(file_path, "r", encoding="utf-8") as f:
+                    md_content = f.read()
+                
+                # Convert to HTML
+                html = self._render_markdown(md_content)
+                self._html_cache[key] = html
             
-            # Open in default browser
-            webbrowser.open(file_url)
+            temp_html = self._open_preview(html)
             return True, f"Preview opened in browser: {temp_html}"
         except Exception as e:
-            return False, f"Error generating preview: {str(e)}"
\ No newline at end of file
+            return False, f"Error generating preview: {str(e)}"
+
+    def _render_markdown(self, md_content):
+        """
+        Convert markdown to HTML, using cmarkgfm when it is installed
+        
+        Args:
+            md_content: Markdown text to render
+            
+        Returns:
+            Rendered HTML string
+        """
+        if cmarkgfm is not None:
+            # Reports embed raw HTML tags, so they must not be stripped
+            return cmarkgfm.github_flavored_markdown_to_html(
+                md_content, options=cmarkgfmOptions.CMARK_OPT_UNSAFE
+            )
+        
+        # Imported on first use so startup doesn't pay for the markdown package
+        import markdown
+        return markdown.markdown(md_content)
+
+    def _open_preview(self, html):
+        """
+        Write rendered HTML to the preview file and open it in the browser
+        
+        Args:
+            html: Rendered report body
+            
+        Returns:
+            Path of the preview HTML file
+        """
+        file_url = f"file://{os.path.abspath(_PREVIEW_PATH)}"
+
+        # Overwrite the same preview file each time rather than creating a new one
+        with open(_PREVIEW_PATH, "w", encoding="utf-8", buffering=65536) as f:
+            f.write(_PREVIEW_HTML.format(body=html))
+        
+        # Open in default browser
+        import webbrowser
+        webbrowser.open(file_url)
+        return _PREVIEW_PATH
\ No newline at end of file
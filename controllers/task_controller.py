@@ -2,8 +2,13 @@
 
 import os
 import uuid
+import atexit
+import numpy as np
+import pandas as pd
 from datetime import datetime
-from tkinter import ttk, messagebox, simpledialog
+
+from constants import EXPORTS_DIR
+from utils.formatting import fmt_min
 
 class TaskController:
     def __init__(self, task_model):
@@ -14,17 +19,26 @@ class TaskController:
             task_model: The data model for tasks
         """
         self.model = task_model
+        
+        # History log location, created once up front
+        self._log_path = os.path.join(EXPORTS_DIR, "task_history.log")
+        os.makedirs(os.path.dirname(self._log_path), exist_ok=True)
+        
+        # History log handle, opened on first append and closed at exit
+        self._log_fh = None
+        atexit.register(self.close_log)
+        
+        # Task lists handed to the views, keyed by name and tagged with the model version they were built from
+        self._task_lists = {}
     
     def get_active_tasks(self):
         """
         Get list of currently active tasks with their start times
         
         Returns:
-            List of tuples (start_time, task_description) ordered by Start Time descending
+            List of tuples (start_time, task_description) ordered by Start Time ascending
         """
-        active = self.model.get_tasks(active=True)
-        active = active.sort_values(by="Start Time", ascending=True)
-        return [(row["Start Time"], row["Task Description"]) for _, row in active.iterrows()]
+        return self._cached_task_list("active", active=True)
     
     def get_finished_tasks(self):
         """
@@ -33,9 +47,31 @@ class TaskController:
         Returns:
             List of tuples (start_time, task_description) ordered by Start Time ascending
         """
-        inactive = self.model.get_tasks(active=False, completed=True)
-        inactive = inactive.sort_values(by="Start Time", ascending=True)
-        return [(row["Start Time"], row["Task Description"]) for _, row in inactive.iterrows()]
+        return self._cached_task_list("finished", active=False, completed=True)
+    
+    def _cached_task_list(self, name, **filters):
+        """
+        Build a (start_time, task_description) list, reusing the last one while the model is unchanged
+        
+        Args:
+            name: Cache key for the list
+            **filters: Filters passed to the model's get_tasks
+            
+        Returns:
+            List of tuples (start_time, task_description) ordered by Start Time ascending
+        """
+        cached = self._task_lists.get(name)
+        if cached is not None and cached[0] == self.model.version:
+            return list(cached[1])
+        
+        tasks = self.model.get_tasks(**filters)
+        # Rows are appended in Start Time order, so only sort if that no longer holds
+        if not tasks["Start Time"].is_monotonic_increasing:
+            tasks = tasks.sort_values(by="Start Time", ascending=True)
+        result = list(zip(tasks["Start Time"].tolist(), tasks["Task Description"].tolist()))
+        
+        self._task_lists[name] = (self.model.version, result)
+        return list(result)
     
     def start_task(self, task_description, notes=""):
         """
@@ -54,14 +90,11 @@ class TaskController:
             return False, "Please enter a task description"
         
         # Check if task is already active
-        active_tasks = self.model.get_tasks(
-            active=True, 
-            task_description=task_description
-        )
+        active_indices = self.model.get_indices(task_description, active=True)
         
-        if not active_tasks.empty:
+        if active_indices:
             # Task is already active, add notes
-            idx = active_tasks.index[-1]
+            idx = active_indices[-1]
             if notes:
                 self.model.add_notes(idx, notes)
             return True, f"Task '{task_description}' is already active. Note added."
@@ -69,13 +102,13 @@ class TaskController:
         # Create a new task
         task_id = str(uuid.uuid4())
         start_time = datetime.now()
-        start_time_str = start_time.strftime("%Y-%m-%d %H:%M")
+        start_time_str = fmt_min(start_time)
         new_task = {
             "Task ID": task_id,
             "Task Description": task_description,
             "Start Time": start_time_str,
             "Stop Time": "",
-            "Duration (min)": "",
+            "Duration (min)": np.nan,  # Numeric column; blank until the task is finished
             "Completed": "No",
             "Notes": notes or "",
             "Active": 1
@@ -106,29 +139,40 @@ class TaskController:
             
         parsed_task_description = task_description.split("] - ", 1)[-1]
         # Find active tasks with this description
-        mask = (self.model.df["Task Description"] == parsed_task_description) & (self.model.df["Active"] == 1)
-        
-        if not any(mask):
+        # Look up the active rows for this description without scanning the DataFrame
+        indices = self.model.get_indices(parsed_task_description, active=True)
+        if not indices:
             return False, f"No active task found with name: {parsed_task_description}"
         
-        stop_time = datetime.now()
-        stop_time_str = stop_time.strftime("%Y-%m-%d %H:%M")
+        # Keep the stop time as a minute-resolution Timestamp so it is stored without re-parsing
+        stop_time = pd.Timestamp.now().floor("min")
+        stop_time_str = fmt_min(stop_time)
         
-        # Update all matching tasks
-        indices = self.model.df[mask].index
-        for idx in indices:
-            self.model.update_task(idx, {
-                "Stop Time": stop_time_str,
-                "Completed": "Yes",
-                "Active": 0,
-                "Updated": stop_time_str
-            })
-            
-            if notes:
-                self.model.add_notes(idx, notes, stop_time)
+        # Start Time is already datetime64 in the model, so durations are one vector subtraction
+        starts = self.model.df.loc[indices, "Start Time"]
+        durations = ((stop_time - starts).dt.total_seconds() / 60).round(2)
+        
+        update_data = {
+            "Stop Time": stop_time,
+            "Duration (min)": durations.tolist(),
+            "Completed": "Yes",
+            "Active": 0,
+            "Updated": stop_time
+        }
+        
+        if notes:
+            # Append the note to every matching task in one pass, only joining
+            # with " | " where the task already has notes
+            current = self.model.df.loc[indices, "Notes"]
+            has_notes = current.notna().to_numpy() & (current != "").to_numpy()
+            joined = current.astype(str).str.strip() + f" | {notes}"
+            update_data["Notes"] = np.where(has_notes, joined.to_numpy(), notes).tolist()
+        
+        # Update all matching tasks at once
+        self.model.update_tasks(indices, update_data)
                 
-            # Log the task completion with consistent format
-            self._append_to_log(f"✅ {stop_time_str} - Completed - {parsed_task_description}\n")
+        # Log the task completion with consistent format
+        self._append_to_log(f"✅ {stop_time_str} - Completed - {parsed_task_description}\n" * len(indices))
                 
         return True, f"Marked '{parsed_task_description}' as completed."
         
@@ -148,19 +192,19 @@ class TaskController:
             print(f"Updating notes for: '{task_description}'")
             
             # Find the task by description
-            task_df = self.model.get_tasks(task_description=task_description)
+            task_indices = self.model.get_indices(task_description)
             
-            if task_df.empty:
+            if not task_indices:
                 print(f"No tasks found matching description: '{task_description}'")
                 return False
             
-            print(f"Found {len(task_df)} matching tasks")
+            print(f"Found {len(task_indices)} matching tasks")
             
             # Update the first matching task (should be unique)
-            task_idx = task_df.index[0]
+            task_idx = task_indices[0]
             
             current_time = timestamp or datetime.now()
-            current_time_str = current_time.strftime("%Y-%m-%d %H:%M")
+            current_time_str = fmt_min(current_time)
             
             print(f"Adding note: '{note}' with timestamp: {current_time_str}")
             
@@ -183,11 +227,11 @@ class TaskController:
             
     def get_task_notes(self, task_description):
         """Fetch all notes for a given task description."""
-        tasks = self.model.get_tasks(task_description=task_description)
-        if tasks.empty:
+        indices = self.model.get_indices(task_description)
+        if not indices:
             return "No notes available."
 
-        notes = tasks["Notes"].dropna().tolist()
+        notes = self.model.df.loc[indices, "Notes"].dropna().tolist()
         return "\n".join(f"> {note.replace(' | ', '\n> ').strip()}" for note in notes)
     
     def _append_to_log(self, entry):
@@ -198,13 +242,26 @@ class TaskController:
             entry: Text entry to append
         """
         try:
-            log_file_path = os.path.join("exports", "task_history.log")
+            if self._log_fh is None:
+                # Line buffered so every entry reaches the file as soon as it is written,
+                # keeping the history in step with the task journal after a hard exit
+                self._log_fh = open(self._log_path, "a", encoding="utf-8", buffering=1)
             
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
-            
-            # Append to the log file - ensure single newline
-            with open(log_file_path, "a", encoding="utf-8") as log_file:
-                log_file.write(entry)
+            self._log_fh.write(entry)
         except Exception as e:
-            print(f"Error appending to log: {e}")
\ No newline at end of file
+            print(f"Error appending to log: {e}")
+    
+    def flush_log(self):
+        """
+        Write any buffered history log entries to disk
+        """
+        if self._log_fh is not None:
+            self._log_fh.flush()
+    
+    def close_log(self):
+        """
+        Close the history log file handle
+        """
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
\ No newline at end of file
@@ -5,12 +5,46 @@ from tkinter import messagebox
 import os
 import sys
 
-# Import application components
+# Import application components (the model, controllers and views are imported
+# once the window is showing, since pulling in pandas is the slowest part of startup)
 from constants import VERSION, CSV_FILE, DEFAULT_WINDOW_SIZE
-from models.task_model import TaskModel
-from controllers.task_controller import TaskController
-from controllers.report_controller import ReportController
-from views.main_view import MainView
+
+def _show_error(e):
+    """
+    Report a fatal error and exit
+    
+    Args:
+        e: The exception that was raised
+    """
+    messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+def _init_backend(root, placeholder):
+    """
+    Build the model, controllers and main view after the window is on screen
+    
+    Args:
+        root: The main Tk window
+        placeholder: Loading label to remove once the view is built
+    """
+    try:
+        from models.task_model import TaskModel
+        from controllers.task_controller import TaskController
+        from controllers.report_controller import ReportController
+        from views.main_view import MainView
+        
+        # Initialize model and controllers
+        task_model = TaskModel(CSV_FILE)
+        task_controller = TaskController(task_model)
+        report_controller = ReportController(task_model)
+        
+        # Initialize the main view
+        placeholder.destroy()
+        root.app = MainView(root, task_controller, report_controller)
+    except Exception as e:
+        _show_error(e)
 
 def main():
     """
@@ -29,21 +63,16 @@ def main():
         except:
             pass  # Ignore icon errors
             
-        # Initialize model and controllers
-        task_model = TaskModel(CSV_FILE)
-        task_controller = TaskController(task_model)
-        report_controller = ReportController(task_model)
-        
-        # Initialize the main view
-        app = MainView(root, task_controller, report_controller)
+        # Show the window right away and load everything else once it is drawn
+        placeholder = tk.Label(root, text="Loading…")
+        placeholder.pack(expand=True)
+        root.update_idletasks()
+        root.after(10, _init_backend, root, placeholder)
         
         # Start the application
         root.mainloop()
     except Exception as e:
-        messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        _show_error(e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,34 @@
 # models/task_model.py
 
 import os
+import json
+import atexit
+from bisect import insort
+from collections import defaultdict
+import numpy as np
 import pandas as pd
+
+# pyarrow parses CSV files in multithreaded C++; fall back to the default pandas parser if missing
+try:
+    import pyarrow
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = None
+
+from pandas.api.types import is_datetime64_any_dtype
 from datetime import datetime
-from tkinter import ttk, messagebox, simpledialog
+
+from constants import TIMESTAMP_FORMAT
+from utils.formatting import fmt_min
+
+# Columns stored as datetime64 in memory and as TIMESTAMP_FORMAT strings on disk
+DATETIME_COLUMNS = ["Start Time", "Stop Time", "Updated"]
+
+# Completed holds only these two values, so it is stored as a categorical in memory
+COMPLETED_DTYPE = pd.CategoricalDtype(["No", "Yes"])
+
+# Number of journaled changes after which the CSV is rewritten and the journal cleared
+JOURNAL_COMPACT_OPS = 100
 
 class TaskModel:
     """
@@ -21,15 +46,52 @@ class TaskModel:
             csv_file: Path to the CSV file for data storage
         """
         self.csv_file = csv_file
-        self.df = None
+        self.journal_file = f"{csv_file}.journal"
+        self._df = None
+        self._pending_rows = []
+        self._journal = None
+        self._pending_ops = 0
+        
+        # Incremented on every change so callers can tell when cached results are stale
+        self.version = 0
         self.load_data()
         
+        # Fold any journaled changes into the CSV when the application exits
+        atexit.register(self.close)
+        
+    @property
+    def df(self):
+        """
+        Task DataFrame, with rows added since the last read appended in one step
+        """
+        if self._pending_rows:
+            new_rows = pd.DataFrame(self._pending_rows).reindex(columns=self._df.columns)
+            self._parse_datetimes(new_rows)
+            self._convert_status(new_rows)
+            self._df = pd.concat([self._df, new_rows], ignore_index=True)
+            self._pending_rows = []
+        return self._df
+    
+    @df.setter
+    def df(self, value):
+        self._df = value
+        self._pending_rows = []
+        self.version += 1
+        
     def load_data(self):
         """
         Load data from CSV or create a new DataFrame if file doesn't exist
         """
         if os.path.exists(self.csv_file):
-            self.df = pd.read_csv(self.csv_file)
+            # Let the CSV parser read the timestamp columns directly; older files may lack some of them
+            header = pd.read_csv(self.csv_file, nrows=0).columns
+            date_columns = [col for col in DATETIME_COLUMNS if col in header]
+            self.df = pd.read_csv(self.csv_file, engine=CSV_ENGINE,
+                                  parse_dates=date_columns, date_format=TIMESTAMP_FORMAT)
+            
+            # pyarrow types the columns of a header-only file as float; keep them untyped like pandas does
+            if self.df.empty:
+                self.df = self.df.astype(object)
         else:
             self.df = pd.DataFrame(columns=[
                 "Task ID", "Task Description", "Start Time", "Stop Time", 
@@ -49,11 +111,130 @@ class TaskModel:
                 self.df[col] = ""  # Using empty string for all columns including Updated
                 columns_added = True  # Set flag when a column is added
         
-        # After adding any missing columns, save the updated DataFrame
+        # Parse timestamps once so reports and views can use them directly
+        self._parse_datetimes(self.df)
+        self._convert_status(self.df)
+        
+        # Index rows by task description for constant time lookups
+        self._build_indices()
+        
+        # Cache column positions so row updates can be written positionally
+        self._col_pos = {col: i for i, col in enumerate(self.df.columns)}
+        
+        # Replay changes journaled since the last full save
+        replayed = self._replay_journal()
+        
+        # After adding any missing columns or replaying the journal, save the updated DataFrame
         if columns_added:
             print("Saving updated DataFrame with missing columns.")
+        if columns_added or replayed:
             self.save_data()
         
+        if self._journal is None:
+            # Line buffered: each record is the only copy of its change until the next
+            # compaction, so it is written through rather than batched in memory
+            self._journal = open(self.journal_file, "a", encoding="utf-8", buffering=1)
+    
+    def _build_indices(self):
+        """
+        Build the task description lookups used by get_indices
+        """
+        self._by_desc = defaultdict(list)
+        self._active_by_desc = defaultdict(list)
+        for idx, desc, active in zip(self.df.index, self.df["Task Description"], self.df["Active"]):
+            self._by_desc[desc].append(idx)
+            if active == 1:
+                self._active_by_desc[desc].append(idx)
+    
+    def _index_row(self, idx):
+        """
+        Add a row to the task description lookups
+        
+        Args:
+            idx: Index of the row
+        """
+        desc = self.df.at[idx, "Task Description"]
+        insort(self._by_desc[desc], idx)
+        if self.df.at[idx, "Active"] == 1:
+            insort(self._active_by_desc[desc], idx)
+    
+    def _unindex_row(self, idx):
+        """
+        Remove a row from the task description lookups
+        
+        Args:
+            idx: Index of the row
+        """
+        desc = self.df.at[idx, "Task Description"]
+        self._by_desc[desc].remove(idx)
+        if idx in self._active_by_desc[desc]:
+            self._active_by_desc[desc].remove(idx)
+    
+    def _parse_datetimes(self, df):
+        """
+        Convert the timestamp columns of a DataFrame to datetime64 in place
+        
+        Args:
+            df: DataFrame containing any of the timestamp columns
+        """
+        for col in DATETIME_COLUMNS:
+            if col not in df.columns:
+                continue
+            raw = df[col]
+            
+            # read_csv normally parses the column already; values in another format leave it as text
+            if is_datetime64_any_dtype(raw):
+                df[col] = raw.astype("datetime64[ns]")
+                continue
+            
+            parsed = pd.to_datetime(raw, format=TIMESTAMP_FORMAT, errors='coerce')
+            
+            # Fall back to inference for values written in another format so they aren't lost on save
+            missed = parsed.isna() & raw.notna() & (raw.astype(str).str.strip() != "")
+            if missed.any():
+                parsed[missed] = pd.to_datetime(raw[missed], errors='coerce')
+            
+            df[col] = parsed
+        
+    def _convert_status(self, df):
+        """
+        Store Active as bool, Completed as a categorical, Duration as float and Notes as text in place
+        
+        Args:
+            df: DataFrame containing any of the Active, Completed, Duration and Notes columns
+        """
+        if "Active" in df.columns:
+            # Blank or unreadable values count as inactive
+            df["Active"] = pd.to_numeric(df["Active"], errors='coerce').fillna(0).astype(bool)
+        if "Completed" in df.columns:
+            df["Completed"] = df["Completed"].astype(COMPLETED_DTYPE)
+        if "Duration (min)" in df.columns:
+            # Blank durations (unfinished tasks, new or empty logs) become NaN
+            df["Duration (min)"] = pd.to_numeric(df["Duration (min)"], errors='coerce').astype("float64")
+        if "Notes" in df.columns and df["Notes"].dtype != object:
+            # A log whose notes are all blank is read as float; keep it text so notes can be set
+            df["Notes"] = df["Notes"].astype(object)
+    
+    def _convert_value(self, column, value):
+        """
+        Convert an update value to the in-memory dtype of its column
+        
+        Args:
+            column: Name of the column being updated
+            value: A single value or a list of values
+            
+        Returns:
+            The converted value
+        """
+        if column in DATETIME_COLUMNS:
+            # Timestamps already match the column dtype and need no parsing
+            if isinstance(value, pd.Timestamp):
+                return value
+            return pd.to_datetime(value, format=TIMESTAMP_FORMAT, errors='coerce')
+        if column == "Active":
+            return [bool(v) for v in value] if isinstance(value, list) else bool(value)
+        return value
+    
     def save_data(self):
         """
         Save the DataFrame to the CSV file
@@ -62,21 +243,113 @@ class TaskModel:
             Boolean indicating success or failure
         """
         try:
-            # Create backup before saving
+            # Save current data to a temporary file first, keeping Active as 1/0 on disk
+            temp_file = f"{self.csv_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8", newline="", buffering=1 << 16) as f:
+                self.df.assign(Active=self.df["Active"].astype(int)).to_csv(
+                    f, index=False, date_format=TIMESTAMP_FORMAT
+                )
+            
+            # The previous CSV becomes the backup by renaming it, then the new file takes its place
             if os.path.exists(self.csv_file):
-                backup_file = f"{self.csv_file}.bak"
-                try:
-                    self.df.to_csv(backup_file, index=False)
-                except Exception as e:
-                    print(f"Error creating backup: {e}")
+                os.replace(self.csv_file, f"{self.csv_file}.bak")
+            os.replace(temp_file, self.csv_file)
             
-            # Save current data
-            self.df.to_csv(self.csv_file, index=False)
+            # Every journaled change is now in the CSV, so start a fresh journal
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(self.journal_file, "w", encoding="utf-8", buffering=1)
+            self._pending_ops = 0
             return True
         except Exception as e:
             print(f"Error saving data: {e}")
             return False
     
+    def close(self):
+        """
+        Save any journaled changes to the CSV and close the journal
+        """
+        if self._journal is None:
+            return
+        if self._pending_ops:
+            self.save_data()
+        self._journal.close()
+        self._journal = None
+    
+    def _write_journal(self, record):
+        """
+        Append a single change record to the journal
+        
+        The full CSV is only rewritten every JOURNAL_COMPACT_OPS changes.
+        
+        Args:
+            record: Dictionary describing the change
+            
+        Returns:
+            Boolean indicating success
+        """
+        try:
+            self._journal.write(json.dumps(record, default=self._journal_default) + "\n")
+            self._pending_ops += 1
+            if self._pending_ops >= JOURNAL_COMPACT_OPS:
+                return self.save_data()
+            return True
+        except Exception as e:
+            print(f"Error writing journal: {e}")
+            return False
+    
+    def _journal_default(self, value):
+        """
+        Convert values json can't serialize natively for the journal
+        
+        Args:
+            value: Value to convert
+            
+        Returns:
+            JSON serializable equivalent
+        """
+        if isinstance(value, datetime):
+            return value.strftime(TIMESTAMP_FORMAT)
+        if isinstance(value, np.generic):
+            return value.item()
+        return str(value)
+    
+    def _replay_journal(self):
+        """
+        Apply changes recorded in the journal to the loaded DataFrame
+        
+        Returns:
+            Boolean indicating whether any changes were replayed
+        """
+        if not os.path.exists(self.journal_file):
+            return False
+        
+        # If the process stopped after the CSV swap but before the journal was cleared,
+        # the journal repeats adds the CSV already holds; skip those by Task ID.
+        # Updates store final values, so replaying them again is harmless
+        saved_ids = set(self._df["Task ID"].dropna().astype(str))
+        
+        replayed = False
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A partially written last entry; nothing after it can be trusted
+                    print("Skipping unreadable journal entry")
+                    break
+                
+                if record["op"] == "add":
+                    if str(record["row"].get("Task ID")) in saved_ids:
+                        continue
+                    self._apply_add(record["row"])
+                elif record["op"] == "update_many":
+                    self._apply_update_many(record["indices"], record["fields"])
+                else:
+                    self._apply_update(record["idx"], record["fields"])
+                replayed = True
+        return replayed
+    
     def get_tasks(self, active=None, completed=None, task_description=None):
         """
         Get tasks based on filters
@@ -89,19 +362,34 @@ class TaskModel:
         Returns:
             Filtered DataFrame
         """
-        filtered_df = self.df.copy()
+        # Combine all filters into a single mask and index the frame once
+        mask = np.ones(len(self.df), dtype=bool)
         
         if active is not None:
-            filtered_df = filtered_df[filtered_df["Active"] == (1 if active else 0)]
+            mask &= self.df["Active"].to_numpy() == bool(active)
             
         if completed is not None:
-            filtered_df = filtered_df[filtered_df["Completed"] == ("Yes" if completed else "No")]
+            # Categorical comparison matches on the integer codes
+            mask &= (self.df["Completed"] == ("Yes" if completed else "No")).to_numpy()
             
         if task_description is not None:
-           ## messagebox.showinfo("Task Description", f"Filtering by task description: {task_description}")##remmove
-            filtered_df = filtered_df[filtered_df["Task Description"] == task_description]
+            mask &= self.df["Task Description"].to_numpy() == task_description
+            
+        return self.df.loc[mask]
+    
+    def get_indices(self, task_description, active=None):
+        """
+        Get row indices of tasks with a given description without scanning the DataFrame
+        
+        Args:
+            task_description: Task description to look up
+            active: If True, only return active tasks
             
-        return filtered_df
+        Returns:
+            List of row indices in insertion order
+        """
+        lookup = self._active_by_desc if active else self._by_desc
+        return list(lookup.get(task_description, ()))
     
     def add_task(self, task_data):
         """
@@ -114,12 +402,30 @@ class TaskModel:
             Boolean indicating success
         """
         try:
-            self.df = pd.concat([self.df, pd.DataFrame([task_data])], ignore_index=True)
-            return self.save_data()
+            self._apply_add(task_data)
+            return self._write_journal({"op": "add", "row": task_data})
         except Exception as e:
             print(f"Error adding task: {e}")
             return False
     
+    def _apply_add(self, task_data):
+        """
+        Append a task row to the in-memory DataFrame
+        
+        Args:
+            task_data: Dictionary containing task data
+        """
+        self.version += 1
+        
+        # Rows are buffered and concatenated on the next read of self.df
+        idx = len(self._df) + len(self._pending_rows)
+        self._pending_rows.append(dict(task_data))
+        
+        desc = task_data.get("Task Description")
+        self._by_desc[desc].append(idx)
+        if task_data.get("Active") == 1:
+            self._active_by_desc[desc].append(idx)
+    
     def update_task(self, idx, update_data):
         """
         Update a task with new values
@@ -132,13 +438,85 @@ class TaskModel:
             Boolean indicating success
         """
         try:
-            for column, value in update_data.items():
-                self.df.at[idx, column] = value
-            return self.save_data()
+            self._apply_update(idx, update_data)
+            return self._write_journal({"op": "update", "idx": idx, "fields": update_data})
         except Exception as e:
             print(f"Error updating task: {e}")
             return False
     
+    def _apply_update(self, idx, update_data):
+        """
+        Set column values of a task in the in-memory DataFrame
+        
+        Args:
+            idx: Index of the task to update
+            update_data: Dictionary of columns and values to update
+        """
+        self.version += 1
+        
+        # Keep the description lookups in sync when a key column changes
+        reindex = "Active" in update_data or "Task Description" in update_data
+        if reindex:
+            self._unindex_row(idx)
+        
+        values = [self._convert_value(column, value) for column, value in update_data.items()]
+        
+        # Write all fields in one positional assignment instead of a label lookup per field
+        cols = [self._col_pos[column] for column in update_data]
+        self.df.iloc[self.df.index.get_loc(idx), cols] = values
+        
+        if reindex:
+            self._index_row(idx)
+    
+    def update_tasks(self, indices, update_data):
+        """
+        Update several tasks with one assignment per column
+        
+        Args:
+            indices: List of task indices to update
+            update_data: Dictionary of columns to either one value for all tasks
+                or a list with one value per task
+            
+        Returns:
+            Boolean indicating success
+        """
+        try:
+            indices = list(indices)
+            self._apply_update_many(indices, update_data)
+            return self._write_journal({"op": "update_many", "indices": indices, "fields": update_data})
+        except Exception as e:
+            print(f"Error updating tasks: {e}")
+            return False
+    
+    def _apply_update_many(self, indices, update_data):
+        """
+        Set column values of several tasks in the in-memory DataFrame
+        
+        Args:
+            indices: List of task indices to update
+            update_data: Dictionary of columns to a value or list of values
+        """
+        self.version += 1
+        
+        # A single row (the usual case when finishing a task) is written with one positional assignment
+        if len(indices) == 1:
+            row_data = {column: value[0] if isinstance(value, list) else value for column, value in update_data.items()}
+            self._apply_update(indices[0], row_data)
+            return
+        
+        # Keep the description lookups in sync when a key column changes
+        reindex = "Active" in update_data or "Task Description" in update_data
+        if reindex:
+            for idx in indices:
+                self._unindex_row(idx)
+        
+        for column, value in update_data.items():
+            self.df.loc[indices, column] = self._convert_value(column, value)
+        
+        if reindex:
+            for idx in indices:
+                self._index_row(idx)
+    
     def add_notes(self, idx, notes, update_time=None):
         """
         Add notes to an existing task
@@ -150,21 +528,22 @@ class TaskModel:
         Returns:
             Boolean indicating success
         """
-        clean_update_time = update_time.strftime("%Y-%m-%d %H:%M") if update_time else None
+        clean_update_time = fmt_min(update_time) if update_time else None
         try:
             # Update the notes
             current_notes = self.df.at[idx, "Notes"]
-            if current_notes:
+            if pd.notna(current_notes) and current_notes:
                 current_notes =  current_notes.strip()
-                self.df.at[idx, "Notes"] = f"{current_notes} | {notes}"
+                update_data = {"Notes": f"{current_notes} | {notes}"}
             else:
-                self.df.at[idx, "Notes"] = notes
+                update_data = {"Notes": notes}
 
             # Update the "Update" column with the timestamp if provided
             if update_time is not None:
-                self.df.at[idx, "Updated"] = clean_update_time
+                update_data["Updated"] = clean_update_time
 
-            return self.save_data()
+            self._apply_update(idx, update_data)
+            return self._write_journal({"op": "update", "idx": idx, "fields": update_data})
         except Exception as e:
             print(f"Error adding notes: {e}")
             return False
@@ -197,33 +576,19 @@ class TaskModel:
             DataFrame with recent tasks
         """
         try:
-            # Create a copy to avoid modifying the original
-            temp_df = self.df.copy()
+            # Determine the last activity time (either Stop Time or Start Time) without copying the frame
+            last = np.fmax(self.df["Start Time"].to_numpy(), self.df["Stop Time"].to_numpy())
             
-            # Convert dates
-            temp_df["Start Time"] = pd.to_datetime(temp_df["Start Time"], errors='coerce')
-            temp_df["Stop Time"] = pd.to_datetime(temp_df["Stop Time"], errors='coerce')
+            # Partition out the newest `limit` rows and only fully order those
+            # (NaT views as the smallest integer, so it ends up last)
+            keys = last.view("i8")
+            k = min(limit, len(keys))
+            if k == 0:
+                return self.df.iloc[:0]
+            top = np.argpartition(keys, len(keys) - k)[len(keys) - k:]
+            order = top[np.argsort(keys[top], kind="stable")[::-1]]
             
-            # Determine the last activity time (either Stop Time or Start Time)
-            temp_df["Last Activity"] = temp_df[["Start Time", "Stop Time"]].max(axis=1)
-            
-            # Sort by Last Activity in descending order
-            temp_df = temp_df.sort_values(by="Last Activity", ascending=False)
-            
-            return temp_df.head(limit)
+            return self.df.iloc[order].assign(**{"Last Activity": last[order]})
         except Exception as e:
             print(f"Error getting recent tasks: {e}")
             return pd.DataFrame()
-        
-
-
-        # Add this method to your TaskModel class
-    def add_updated_column(self):
-        """
-        Add the 'Updated' column to the tasks DataFrame and save changes.
-        """
-        # Add the Updated column with NaN values
-        self.tasks_df['Updated'] = ""
-        
-        # Save the updated DataFrame back to the file
-        self.save_tasks()
\ No newline at end of file
@@ -0,0 +1,163 @@
+# tests/test_task_model.py
+
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+import numpy as np
+
+from models import task_model
+from models.task_model import TaskModel
+
+def make_task(description, start="2025-04-24 10:00"):
+    """
+    Build a new active task row the way TaskController.start_task does
+    
+    Args:
+        description: Task description
+        start: Start Time string
+        
+    Returns:
+        Dictionary of task data
+    """
+    return {
+        "Task ID": str(uuid.uuid4()),
+        "Task Description": description,
+        "Start Time": start,
+        "Stop Time": "",
+        "Duration (min)": np.nan,
+        "Completed": "No",
+        "Notes": "",
+        "Active": 1
+    }
+
+def finish(model, description):
+    """
+    Mark the active tasks with a description as completed, like TaskController.finish_task
+    
+    Args:
+        model: TaskModel to update
+        description: Task description to finish
+    """
+    indices = model.get_indices(description, active=True)
+    model.update_tasks(indices, {
+        "Stop Time": "2025-04-24 11:00",
+        "Completed": "Yes",
+        "Active": 0,
+        "Updated": "2025-04-24 11:00"
+    })
+
+class TaskModelPersistenceTest(unittest.TestCase):
+    """
+    Journal replay, compaction and description index behaviour of TaskModel
+    """
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.tmp_dir, "task_log.csv")
+        self.models = []
+    
+    def tearDown(self):
+        for model in self.models:
+            self.crash(model)
+        shutil.rmtree(self.tmp_dir)
+    
+    def open_model(self):
+        model = TaskModel(self.csv_file)
+        self.models.append(model)
+        return model
+    
+    def crash(self, model):
+        # Drop the journal handle without saving, so the atexit hook has nothing to do
+        if model._journal is not None:
+            model._journal.close()
+            model._journal = None
+    
+    def test_reload_replays_journal_after_crash_without_save(self):
+        model = self.open_model()
+        model.add_task(make_task("A"))
+        model.add_task(make_task("B"))
+        finish(model, "A")
+        model.add_notes(1, "note")
+        self.crash(model)
+        
+        reloaded = self.open_model()
+        self.assertEqual(reloaded.df["Task Description"].tolist(), ["A", "B"])
+        self.assertEqual(reloaded.df["Active"].tolist(), [False, True])
+        self.assertEqual(reloaded.df["Completed"].tolist(), ["Yes", "No"])
+        self.assertEqual(reloaded.df.at[1, "Notes"], "note")
+        self.assertEqual(reloaded.df["Duration (min)"].dtype, np.float64)
+    
+    def test_crash_between_csv_swap_and_journal_reset_does_not_duplicate_adds(self):
+        model = self.open_model()
+        model.add_task(make_task("A"))
+        finish(model, "A")
+        with open(model.journal_file, encoding="utf-8") as f:
+            journal = f.read()
+        
+        # The CSV already holds the changes, but the journal was never cleared
+        model.save_data()
+        self.crash(model)
+        with open(model.journal_file, "w", encoding="utf-8") as f:
+            f.write(journal)
+        
+        reloaded = self.open_model()
+        self.assertEqual(len(reloaded.df), 1)
+        self.assertEqual(reloaded.df["Active"].tolist(), [False])
+    
+    def test_journal_is_compacted_into_csv(self):
+        model = self.open_model()
+        for i in range(task_model.JOURNAL_COMPACT_OPS):
+            model.add_task(make_task(f"Task {i}"))
+        
+        # The last add hit the threshold, so the CSV was rewritten and the journal emptied
+        self.assertEqual(model._pending_ops, 0)
+        self.assertEqual(os.path.getsize(model.journal_file), 0)
+        self.assertTrue(os.path.exists(f"{self.csv_file}.bak"))
+        
+        model.add_task(make_task("After"))
+        self.crash(model)
+        
+        reloaded = self.open_model()
+        self.assertEqual(len(reloaded.df), task_model.JOURNAL_COMPACT_OPS + 1)
+        self.assertEqual(reloaded.df["Task Description"].iloc[-1], "After")
+    
+    def test_get_indices_after_finish_and_restart(self):
+        model = self.open_model()
+        model.add_task(make_task("A"))
+        model.add_task(make_task("B"))
+        finish(model, "A")
+        self.assertEqual(model.get_indices("A", active=True), [])
+        self.assertEqual(model.get_indices("A"), [0])
+        
+        # Starting the same description again only makes the new row active
+        model.add_task(make_task("A", start="2025-04-24 12:00"))
+        self.assertEqual(model.get_indices("A", active=True), [2])
+        self.assertEqual(model.get_indices("A"), [0, 2])
+        self.assertEqual(model.get_indices("B", active=True), [1])
+    
+    def test_get_indices_after_finishing_several_rows(self):
+        model = self.open_model()
+        model.add_task(make_task("A"))
+        model.add_task(make_task("A", start="2025-04-24 10:30"))
+        
+        # Two rows go through the multi-row update path
+        finish(model, "A")
+        self.assertEqual(model.get_indices("A", active=True), [])
+        self.assertEqual(model.df["Active"].tolist(), [False, False])
+    
+    def test_get_indices_rebuilt_on_reload(self):
+        model = self.open_model()
+        model.add_task(make_task("A"))
+        finish(model, "A")
+        model.add_task(make_task("A", start="2025-04-24 12:00"))
+        model.save_data()
+        self.crash(model)
+        
+        reloaded = self.open_model()
+        self.assertEqual(reloaded.get_indices("A", active=True), [1])
+        self.assertEqual(reloaded.get_indices("A"), [0, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,13 @@
+# utils/formatting.py
+
+def fmt_min(dt):
+    """
+    Format a datetime as "YYYY-MM-DD HH:MM" (same output as TIMESTAMP_FORMAT)
+
+    Args:
+        dt: datetime to format
+
+    Returns:
+        Formatted timestamp string
+    """
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
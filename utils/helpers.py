@@ -4,6 +4,23 @@ import tkinter as tk
 from tkinter import ttk
 from constants import COLORS
 
+# Button styles by type, with the final font tuple already resolved
+_BUTTON_STYLES = {
+    "default": {"bg": COLORS["secondary"], "fg": COLORS["text"], "font": ("Arial", 10, "normal")},
+    "primary": {"bg": COLORS["primary"], "fg": COLORS["background"], "font": ("Arial", 10, "bold")},
+    "success": {"bg": COLORS["success"], "fg": COLORS["background"], "font": ("Arial", 10, "bold")},
+    "warning": {"bg": COLORS["warning"], "fg": COLORS["text"], "font": ("Arial", 10, "bold")},
+    "danger": {"bg": COLORS["danger"], "fg": COLORS["background"], "font": ("Arial", 10, "bold")}
+}
+
+# Label styles by name, with the final font tuple already resolved
+_LABEL_STYLES = {
+    "default": {"font": ("Arial", 10, "normal"), "fg": COLORS["text"]},
+    "header": {"font": ("Arial", 14, "bold"), "fg": COLORS["primary"]},
+    "subheader": {"font": ("Arial", 12, "bold"), "fg": COLORS["text"]},
+    "small": {"font": ("Arial", 8, "normal"), "fg": COLORS["light_text"]}
+}
+
 def create_button(parent, text, command, button_type="default", width=None, padx=10, pady=5):
     """
     Create a standardized button with consistent styling based on type
@@ -20,41 +37,7 @@ def create_button(parent, text, command, button_type="default", width=None, padx
     Returns:
         The configured button widget
     """
-    button_styles = {
-        "default": {
-            "bg": COLORS["secondary"],
-            "fg": COLORS["text"],
-            "font": ("Arial", 10),
-            "bold": False
-        },
-        "primary": {
-            "bg": COLORS["primary"],
-            "fg": COLORS["background"],
-            "font": ("Arial", 10),
-            "bold": True
-        },
-        "success": {
-            "bg": COLORS["success"],
-            "fg": COLORS["background"],
-            "font": ("Arial", 10),
-            "bold": True
-        },
-        "warning": {
-            "bg": COLORS["warning"],
-            "fg": COLORS["text"],
-            "font": ("Arial", 10),
-            "bold": True
-        },
-        "danger": {
-            "bg": COLORS["danger"],
-            "fg": COLORS["background"],
-            "font": ("Arial", 10),
-            "bold": True
-        }
-    }
-    
-    style = button_styles.get(button_type, button_styles["default"])
-    font = (style["font"][0], style["font"][1], "bold" if style["bold"] else "normal")
+    style = _BUTTON_STYLES.get(button_type, _BUTTON_STYLES["default"])
     
     button = tk.Button(
         parent,
@@ -62,7 +45,7 @@ def create_button(parent, text, command, button_type="default", width=None, padx
         command=command,
         bg=style["bg"],
         fg=style["fg"],
-        font=font,
+        font=style["font"],
         relief=tk.RAISED,
         borderwidth=2,
         padx=padx,
@@ -88,36 +71,12 @@ def create_label(parent, text, style="default", anchor="w", pady=(0, 5)):
     Returns:
         The configured label widget
     """
-    label_styles = {
-        "default": {
-            "font": ("Arial", 10),
-            "fg": COLORS["text"],
-            "bold": False
-        },
-        "header": {
-            "font": ("Arial", 14),
-            "fg": COLORS["primary"],
-            "bold": True
-        },
-        "subheader": {
-            "font": ("Arial", 12),
-            "fg": COLORS["text"],
-            "bold": True
-        },
-        "small": {
-            "font": ("Arial", 8),
-            "fg": COLORS["light_text"],
-            "bold": False
-        }
-    }
-    
-    style_config = label_styles.get(style, label_styles["default"])
-    font = (style_config["font"][0], style_config["font"][1], "bold" if style_config["bold"] else "normal")
+    style_config = _LABEL_STYLES.get(style, _LABEL_STYLES["default"])
     
     label = tk.Label(
         parent,
         text=text,
-        font=font,
+        font=style_config["font"],
         fg=style_config["fg"],
         bg=COLORS["background"]
     )
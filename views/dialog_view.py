@@ -3,6 +3,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from constants import COLORS
+from utils.helpers import create_entry
+
+# Fonts shared by the dialog widgets
+_FONT_HEADER = ("Arial", 12, "bold")
+_FONT_BODY = ("Arial", 10)
+_FONT_BOLD = ("Arial", 10, "bold")
+_FONT_LIST = ("Courier", 10)
 
 class TaskDialogFactory:
     """
@@ -20,8 +27,46 @@ class TaskDialogFactory:
         self.parent = parent
         self.task_controller = task_controller
         self.report_controller = report_controller
+        
+        # Register the dialog widget styles once instead of passing colors and fonts per widget
+        style = ttk.Style(self.parent)
+        style.configure("DialogHeader.TFrame", background=COLORS["primary"])
+        style.configure("Dialog.TFrame", background=COLORS["background"])
+        style.configure("DialogHeader.TLabel", background=COLORS["primary"], foreground=COLORS["background"], font=_FONT_HEADER)
+        style.configure("Dialog.TLabel", background=COLORS["background"], foreground=COLORS["text"], font=_FONT_BODY)
+        style.configure("DialogBold.TLabel", background=COLORS["background"], foreground=COLORS["text"], font=_FONT_BOLD)
+        style.configure("DialogList.TLabel", background=COLORS["background"], foreground=COLORS["text"], font=_FONT_LIST)
+        style.configure("Cancel.TButton", background=COLORS["secondary"], foreground=COLORS["text"], font=_FONT_BODY, padding=(10, 5))
+        style.configure("Start.TButton", background=COLORS["success"], foreground=COLORS["background"], font=_FONT_BOLD, padding=(20, 5))
+        
+        # Last known parent position/width, kept current from <Configure> events
+        self._parent_geom = None
+        self.parent.bind("<Configure>", self._cache_parent_geom, add="+")
+        
+        # Tcl list variable backing the markdown file listbox
+        self._mds_var = None
+        
+        # Dialogs are built once and hidden on close, then reused on the next open
+        self._start_dialog = None
+        self._start_callback = None
+        self._regen_dialog = None
+        self._regen_callback = None
+        
+        # Set while a start task submission is pending, to drop repeat clicks
+        self._submitting = False
     
-    def create_dialog(self, title, width=350, height=200):
+    def _cache_parent_geom(self, event):
+        """
+        Remember the parent window geometry whenever it moves or resizes
+        
+        Args:
+            event: Tk <Configure> event
+        """
+        # Child widgets share the parent's bindtag, so ignore their events
+        if event.widget is self.parent:
+            self._parent_geom = (event.x, event.y, event.width)
+    
+    def create_dialog(self, title, width=350, height=200, withdrawn=False, modal=False):
         """
         Create a standard dialog window with consistent styling
         
@@ -29,50 +74,114 @@ class TaskDialogFactory:
             title: Dialog title
             width: Dialog width
             height: Dialog height
+            withdrawn: Keep the dialog hidden while its widgets are built;
+                the caller must then call show_dialog
+            modal: Keep the dialog above the main window and grab input until it closes
             
         Returns:
             Tuple of (dialog window, content frame)
         """
         dialog = tk.Toplevel(self.parent)
+        if withdrawn:
+            dialog.withdraw()
         dialog.title(title)
         dialog.geometry(f"{width}x{height}")
-        
-        # Safer popup positioning
-        self.parent.update_idletasks()
-        main_x = self.parent.winfo_x()
-        main_y = self.parent.winfo_y()
-        main_w = self.parent.winfo_width()
-        
-        if main_x < 0 or main_y < 0:
-            main_x = 100
-            main_y = 100
-        
-        dialog.geometry(f"+{main_x + main_w + 10}+{main_y}")
-        dialog.attributes("-topmost", True)
-        dialog.grab_set()
+        self._position_dialog(dialog)
+        if modal:
+            # A transient dialog stays above its parent without being pinned over other apps
+            dialog.transient(self.parent)
+            # A hidden window can't take the grab; show_dialog sets it instead
+            if not withdrawn:
+                dialog.grab_set()
+        else:
+            self._raise_dialog(dialog)
         
         # Style the dialog
         dialog.configure(bg=COLORS["background"])
         
         # Create a header
-        header = tk.Frame(dialog, bg=COLORS["primary"], padx=10, pady=5)
+        # ttk frames only take padding from the widget option, not from the style
+        header = ttk.Frame(dialog, style="DialogHeader.TFrame", padding=(10, 5))
         header.pack(fill="x")
         
-        header_label = tk.Label(
-            header,
-            text=title,
-            font=("Arial", 12, "bold"),
-            fg=COLORS["background"],
-            bg=COLORS["primary"]
-        )
+        header_label = ttk.Label(header, text=title, style="DialogHeader.TLabel")
         header_label.pack(anchor="w")
         
         # Create a content frame
-        content = tk.Frame(dialog, bg=COLORS["background"], padx=15, pady=15)
+        content = ttk.Frame(dialog, style="Dialog.TFrame", padding=15)
         content.pack(fill="both", expand=True)
         
         return dialog, content
     
+    def _position_dialog(self, dialog):
+        """
+        Place a dialog to the right of the parent window
+        
+        Args:
+            dialog: Dialog window to position
+        """
+        # Safer popup positioning, from the cached geometry when available so
+        # opening a dialog doesn't force a layout pass
+        if self._parent_geom is None:
+            self.parent.update_idletasks()
+            self._parent_geom = (self.parent.winfo_x(), self.parent.winfo_y(), self.parent.winfo_width())
+        main_x, main_y, main_w = self._parent_geom
+        
+        if main_x < 0 or main_y < 0:
+            main_x = 100
+            main_y = 100
+        
+        dialog.geometry(f"+{main_x + main_w + 10}+{main_y}")
+    
+    def _raise_dialog(self, dialog):
+        """
+        Bring a dialog to the front, keeping it above an always-on-top main window
+        
+        Args:
+            dialog: Dialog window to raise
+        """
+        # Only pin the dialog when the main window is pinned, otherwise it would open behind it
+        dialog.attributes("-topmost", bool(self.parent.attributes("-topmost")))
+        dialog.lift()
+    
+    def show_dialog(self, dialog, modal=False):
+        """
+        Show a dialog created with withdrawn=True once all its widgets exist
+        
+        Args:
+            dialog: Dialog window to show
+            modal: Grab input for the dialog, as passed to create_dialog
+        """
+        dialog.deiconify()
+        if modal:
+            dialog.grab_set()
+        else:
+            # The main window's always-on-top setting may have changed since the dialog was built
+            self._raise_dialog(dialog)
+    
+    def hide_dialog(self, dialog):
+        """
+        Hide a reusable dialog instead of destroying it
+        
+        Args:
+            dialog: Dialog window to hide
+        """
+        # No-op unless the dialog was shown modal
+        dialog.grab_release()
+        dialog.withdraw()
+    
+    def _reusable(self, cached):
+        """
+        Check whether a cached dialog can be shown again
+        
+        Args:
+            cached: Tuple starting with the dialog window, or None
+            
+        Returns:
+            Boolean indicating the dialog still exists
+        """
+        return cached is not None and cached[0].winfo_exists()
+    
     def create_regen_preview_report_dialog(self, callback=None):
         """
         Create a dialog for regenerating a preview report
@@ -80,34 +189,36 @@ class TaskDialogFactory:
         Args:
             callback: Function to call after successful report generation
         """
+        self._regen_callback = callback
+        
+        # Show the dialog from the last open again, reloading its file list
+        if self._reusable(self._regen_dialog):
+            dialog = self._regen_dialog[0]
+            self._load_regen_files()
+            self._position_dialog(dialog)
+            self.show_dialog(dialog, modal=True)
+            return
 
-        dialog, content = self.create_dialog("Regen Preview", 500, 400)
+        # Build the whole dialog while hidden so it is laid out once when shown
+        dialog, content = self.create_dialog("Regen Preview", 500, 400, withdrawn=True, modal=True)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self.hide_dialog(dialog))
         # Build form
-        tk.Label(
-            content, 
-            text="Select MD file to regen:",
-            font=("Arial", 10, "bold"),
-            bg=COLORS["background"],
-            fg=COLORS["text"]
-        ).pack(anchor="w", pady=(0, 5))
+        ttk.Label(content, text="Select MD file to regen:", style="DialogBold.TLabel").pack(anchor="w", pady=(0, 5))
 
-        # Fetch tasks based on task_type
-        mds = self.report_controller.list_markdown_files()
+        # Shown instead of the file list while loading or when there are no markdown files
+        empty_label = ttk.Label(content, style="DialogList.TLabel")
 
-        if not mds:
-            tk.Label(content, text="No active tasks available.", font=("Courier", 10), bg=COLORS["background"], fg=COLORS["text"]).pack(pady=20)
-            return
+        # The file list and its buttons, shown when there are markdown files
+        list_frame = ttk.Frame(content, style="Dialog.TFrame")
 
-        # Create a listbox for tasks
-        mds_listbox = tk.Listbox(content, bg=COLORS["background"], fg=COLORS["text"], font=("Courier", 10))
+        # Create a listbox filled from a Tcl list variable in one assignment, keeping
+        # a reference so the variable isn't unset while the dialog is open
+        self._mds_var = tk.StringVar()
+        mds_listbox = tk.Listbox(list_frame, listvariable=self._mds_var, bg=COLORS["background"], fg=COLORS["text"], font=_FONT_LIST)
         mds_listbox.pack(fill="both", expand=True, padx=10, pady=5)
-
-        # Populate the listbox with markdown files
-        for md_file in mds:
-            mds_listbox.insert(tk.END, md_file)
         
         # Button frame
-        button_frame = tk.Frame(content, bg=COLORS["background"])
+        button_frame = ttk.Frame(list_frame, style="Dialog.TFrame")
         button_frame.pack(fill="x", pady=(15, 0))
         
         def on_submit():
@@ -116,48 +227,73 @@ class TaskDialogFactory:
                 messagebox.showwarning("No Selection", "Please select a MD file.")
                 return
 
-            selected_md = [mds_listbox.get(i) for i in selected]
-          
-            selected_md = selected_md[0].strip("[]'")
-            print(f"Selected MD: {selected_md}")
+            # Single-selection listbox, so only the first index matters
+            selected_md = mds_listbox.get(selected[0])
             success, message = self.report_controller.preview_existing_markdown(selected_md)
             
             if success:
                 messagebox.showinfo("Success", message)
-                dialog.destroy()
-                if callback:
-                    callback()
+                self.hide_dialog(dialog)
+                if self._regen_callback:
+                    self._regen_callback()
             else:
                 messagebox.showwarning("Warning", message)
         
         # Create the buttons
-        cancel_button = tk.Button(
-            button_frame,
-            text="Cancel",
-            command=dialog.destroy,
-            bg=COLORS["secondary"],
-            fg=COLORS["text"],
-            font=("Arial", 10),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5
-        )
+        cancel_button = ttk.Button(button_frame, text="Cancel", command=lambda: self.hide_dialog(dialog), style="Cancel.TButton")
         cancel_button.pack(side="left", padx=5)
         
-        start_button = tk.Button(
-            button_frame,
-            text="Start",
-            command=on_submit,
-            bg=COLORS["success"],
-            fg=COLORS["background"],
-            font=("Arial", 10, "bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=20,
-            pady=5
-        )
+        start_button = ttk.Button(button_frame, text="Start", command=on_submit, style="Start.TButton")
         start_button.pack(side="right", padx=5)
+        
+        self._regen_dialog = (dialog, mds_listbox, list_frame, empty_label)
+        self._load_regen_files()
+        self.show_dialog(dialog, modal=True)
+    
+    def _load_regen_files(self):
+        """
+        Reload the regen dialog file list in the background, showing "Loading…" meanwhile
+        """
+        self._fill_regen_dialog(None)
+        future = self.report_controller.list_markdown_files_async()
+        self._regen_dialog[0].after(20, self._poll_regen_files, future)
+    
+    def _poll_regen_files(self, future):
+        """
+        Fill the regen dialog once the background file listing finishes
+        
+        Args:
+            future: Future resolving to the list of markdown filenames
+        """
+        dialog = self._regen_dialog[0]
+        if not dialog.winfo_exists():
+            return
+        
+        # Tk must only be touched from this thread, so poll rather than call back from the worker
+        if not future.done():
+            dialog.after(20, self._poll_regen_files, future)
+            return
+        
+        self._fill_regen_dialog(future.result())
+    
+    def _fill_regen_dialog(self, mds):
+        """
+        Show the markdown files in the regen dialog, or a notice if there are none
+        
+        Args:
+            mds: List of markdown filenames, or None while they are loading
+        """
+        _, mds_listbox, list_frame, empty_label = self._regen_dialog
+        self._mds_var.set(mds or [])
+        mds_listbox.selection_clear(0, tk.END)
+        
+        if mds:
+            empty_label.pack_forget()
+            list_frame.pack(fill="both", expand=True)
+        else:
+            list_frame.pack_forget()
+            empty_label.config(text="Loading…" if mds is None else "No active tasks available.")
+            empty_label.pack(pady=20)
     
     def create_start_task_dialog(self, callback=None):
         """
@@ -169,45 +305,38 @@ class TaskDialogFactory:
         # Get inactive tasks for the dropdown
        ## inactive_tasks = self.task_controller.get_inactive_tasks() ## removed stop task functionality so no need to restart.
         
+        self._start_callback = callback
+        
+        # Show the dialog from the last open again with the form cleared
+        if self._reusable(self._start_dialog):
+            dialog, task_var, task_entry, note_entry = self._start_dialog
+            task_var.set("")
+            note_entry.delete("1.0", tk.END)
+            self._position_dialog(dialog)
+            self.show_dialog(dialog, modal=True)
+            task_entry.focus_set()
+            return
+        
         # Create dialog
-        dialog, content = self.create_dialog("Start Task")
+        dialog, content = self.create_dialog("Start Task", withdrawn=True, modal=True)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self.hide_dialog(dialog))
         dialog.update_idletasks()  # Update geometry calculations
         dialog.geometry("")  # Let tkinter auto-size the dialog based on its content
         
         # Build form
-        tk.Label(
-            content, 
-            text="Enter new task:",
-            font=("Arial", 10, "bold"),
-            bg=COLORS["background"],
-            fg=COLORS["text"]
-        ).pack(anchor="w", pady=(0, 5))
+        ttk.Label(content, text="Enter new task:", style="DialogBold.TLabel").pack(anchor="w", pady=(0, 5))
         
         task_var = tk.StringVar()
               
-        task_entry = tk.Entry(
-            content, 
-            textvariable=task_var, 
-            width=45,
-            font=("Arial", 10),
-            bd=2,
-            relief=tk.GROOVE
-        )
-        task_entry.pack(fill="x", pady=5)
+        task_entry = create_entry(content, textvariable=task_var)
         
-        tk.Label(
-            content, 
-            text="Notes:",
-            font=("Arial", 10),
-            bg=COLORS["background"],
-            fg=COLORS["text"]
-        ).pack(anchor="w", pady=(10, 5))
+        ttk.Label(content, text="Notes:", style="Dialog.TLabel").pack(anchor="w", pady=(10, 5))
         
         note_entry = tk.Text(
             content, 
             width=45,
             height=5,  # Set height for multiline input
-            font=("Arial", 10),
+            font=_FONT_BODY,
             bd=2,
             relief=tk.GROOVE
         )
@@ -215,52 +344,46 @@ class TaskDialogFactory:
 
         def on_submit():
             """Handle task submission"""
-            selected_task = task_var.get().strip()
-            note = note_entry.get("1.0", tk.END).strip()  # Get multiline text
-            
-            success, message = self.task_controller.start_task(selected_task, note)
-            
-            if success:
-                messagebox.showinfo("Success", message)
-                # dialog.destroy()
-                if callback:
-                    callback()
-            else:
-                messagebox.showwarning("Warning", message)
+            # Ignore repeat clicks while the previous submission is still pending
+            if self._submitting:
+                return
+            self._submitting = True
+            start_button.config(state="disabled")
+            dialog.after_idle(submit_task)
+        
+        def submit_task():
+            """Start the task, then re-enable the Start button"""
+            try:
+                selected_task = task_var.get().strip()
+                note = note_entry.get("1.0", tk.END).strip()  # Get multiline text
+                
+                success, message = self.task_controller.start_task(selected_task, note)
+                
+                if success:
+                    messagebox.showinfo("Success", message)
+                    # dialog.destroy()
+                    if self._start_callback:
+                        self._start_callback()
+                else:
+                    messagebox.showwarning("Warning", message)
+            finally:
+                self._submitting = False
+                start_button.config(state="normal")
         
         # Button frame
-        button_frame = tk.Frame(content, bg=COLORS["background"])
+        button_frame = ttk.Frame(content, style="Dialog.TFrame")
         button_frame.pack(fill="x", pady=(15, 0))
         
         # Create the buttons
-        cancel_button = tk.Button(
-            button_frame,
-            text="Cancel",
-            command=dialog.destroy,
-            bg=COLORS["secondary"],
-            fg=COLORS["text"],
-            font=("Arial", 10),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5
-        )
+        cancel_button = ttk.Button(button_frame, text="Cancel", command=lambda: self.hide_dialog(dialog), style="Cancel.TButton")
         cancel_button.pack(side="left", padx=5)
         
-        start_button = tk.Button(
-            button_frame,
-            text="Start",
-            command=on_submit,
-            bg=COLORS["success"],
-            fg=COLORS["background"],
-            font=("Arial", 10, "bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=20,
-            pady=5
-        )
+        start_button = ttk.Button(button_frame, text="Start", command=on_submit, style="Start.TButton")
         start_button.pack(side="right", padx=5)
         
+        self._start_dialog = (dialog, task_var, task_entry, note_entry)
+        self.show_dialog(dialog, modal=True)
+        
         # Focus the entry
         task_entry.focus_set()
             
@@ -4,13 +4,20 @@ import os
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from datetime import datetime
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 import uuid
+from bisect import bisect_right
 
 
 # Import from other modules
-from constants import VERSION, COLORS
+from constants import VERSION, COLORS, EXPORTS_DIR
 from views.dialog_view import TaskDialogFactory
+from utils.formatting import fmt_min
+
+# Static status bar text, built once when the module is imported
+STATUS_TEXT = f"Task Logger {VERSION} • Last updated: {datetime.now():%Y-%m-%d}"
 
 
 class MainView:
@@ -38,6 +45,14 @@ class MainView:
         # Initialize filter state variable
         self.current_filter = "all"  # Default to showing all tasks
         
+        # Parsed history log entries (newest first, with their sort keys) and how far into the log file they go
+        self._history_entries = []
+        self._history_keys = []
+        self._history_pos = 0
+        
+        # Whether a history refresh is already queued
+        self._refresh_pending = False
+        
         # Configure styles
         self.configure_styles()
         
@@ -91,6 +106,21 @@ class MainView:
     
     def setup_ui(self):
         """Set up the user interface components"""
+        # Register the options shared by the action and filter buttons once in the Tk option
+        # database instead of passing them to every constructor
+        self.root.option_add("*actions*Button.foreground", COLORS["background"])
+        self.root.option_add("*actions*Button.font", "Arial 10 bold")
+        self.root.option_add("*actions*Button.relief", "raised")
+        self.root.option_add("*actions*Button.borderWidth", 2)
+        self.root.option_add("*actions*Button.padX", 10)
+        self.root.option_add("*actions*Button.padY", 5)
+        
+        self.root.option_add("*filters*Button.font", "Arial 10")
+        self.root.option_add("*filters*Button.relief", "flat")
+        self.root.option_add("*filters*Button.borderWidth", 2)
+        self.root.option_add("*filters*Button.padX", 5)
+        self.root.option_add("*filters*Button.padY", 5)
+        
         # Configure the root window to use grid
         self.root.configure(bg=COLORS["background"])
         
@@ -120,7 +150,7 @@ class MainView:
 
     def setup_logging(self):
         """Set up the initial log file."""
-        log_file_path = "exports/task_history.log"  # Path to the log file
+        log_file_path = os.path.join(EXPORTS_DIR, "task_history.log")  # Path to the log file
 
         # Use the task_controller to fetch the DataFrame
         df = self.task_controller.model.get_tasks()  # Fetch all tasks from the model
@@ -141,7 +171,7 @@ class MainView:
         """Create a log entry for clearing exports folder"""
         task_id = str(uuid.uuid4())
         start_time = datetime.now()
-        start_time_str = start_time.strftime("%Y-%m-%d %H:%M")
+        start_time_str = fmt_min(start_time)
         
         # Add to task database
         new_task = {
@@ -149,9 +179,9 @@ class MainView:
             "Task Description": "Clear exports folder",
             "Start Time": start_time_str,
             "Stop Time": start_time_str,
-            "Duration (min)": "",
+            "Duration (min)": np.nan,  # Numeric column; blank until the task is finished
             "Completed": "Yes",
-            "Notes": "HTML files cleared from exports folder",
+            "Notes": "HTML preview files cleared",
             "Active": 0,
             "Updated": start_time_str
         }
@@ -195,6 +225,7 @@ class MainView:
         """Create the task actions section"""
         actions_frame = tk.LabelFrame(
             parent, 
+            name="actions",
             text="Actions", 
             bg=COLORS["background"],
             fg=COLORS["text"],
@@ -220,12 +251,6 @@ class MainView:
             text="Start Task", 
             command=self._show_start_task_dialog, 
             bg=COLORS["primary"],
-            fg=COLORS["background"],
-            font=("Arial", 10, "bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5,
             width=min_width  # Set minimum width
         )
         start_button.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
@@ -235,12 +260,6 @@ class MainView:
             text="View Active Tasks", 
             command=self._show_tasks_window, 
             bg=COLORS["primary"],
-            fg=COLORS["background"], 
-            font=("Arial", 10, "bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5,
             width=min_width  # Set minimum width
         )
         show_active_tasks.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
@@ -250,12 +269,6 @@ class MainView:
             text="View Completed Tasks", 
             command=lambda: self._show_tasks_window("finished"), 
             bg=COLORS["primary"],
-            fg=COLORS["background"], 
-            font=("Arial", 10, "bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5,
             width=min_width  # Set minimum width
         )
         show_inactive_tasks.grid(row=0, column=2, padx=5, pady=5, sticky="ew")
@@ -266,13 +279,7 @@ class MainView:
             button_frame,
             text="Generate Weekly Report",
             command=self._preview_report,
-            bg=COLORS["success"],
-            fg=COLORS["background"],
-            font=("Arial", 10,"bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5
+            bg=COLORS["success"]
         )
         preview_button.grid(row=1, column=0, padx=5, pady=5, sticky="ew")  # Note the columnspan=4
 
@@ -281,29 +288,16 @@ class MainView:
             button_frame,
             text="Regenerate Preview",
             command=self._show_regen_preview_report,
-            bg=COLORS["success"],
-            fg=COLORS["background"],
-            font=("Arial", 10,"bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5
+            bg=COLORS["success"]
         )
         regenerate_preview.grid(row=1, column=1, padx=5, pady=5, sticky="ew")  # Note the columnspan=4
 
         
         clear_exports_folder = tk.Button(
             button_frame, 
-            text="Clear Exports Folder", 
+            text="Clear Previews", 
             command=self._clear_exports_folder,
             bg=COLORS["critical_action"],
-            fg=COLORS["background"], 
-            font=("Arial", 10, "bold"),
-            relief=tk.RAISED,
-            borderwidth=2,
-            padx=10,
-            pady=5,
-
             width=min_width  # Set minimum width
         )
         clear_exports_folder.grid(row=1, column=2, padx=5, pady=5, sticky="ew")
@@ -331,7 +325,7 @@ class MainView:
         history_font = ("Consolas", 10)
 
         # Add filter buttons directly to the history frame
-        button_frame = tk.Frame(history_frame, bg=COLORS["background"])
+        button_frame = tk.Frame(history_frame, name="filters", bg=COLORS["background"])
         button_frame.pack(fill="x", pady=(0, 0))
 
         self.all_button = tk.Button(
@@ -339,12 +333,7 @@ class MainView:
             text="All History",
             command=lambda: self.filter_tasks("all"),
             bg=COLORS["primary"],
-            fg=COLORS["background"],
-            font=("Arial", 10),
-            relief=tk.FLAT,
-            borderwidth=2,
-            padx=5,
-            pady=5
+            fg=COLORS["background"]
         )
         self.all_button.grid(row=0, column=0, padx=2, pady=5, sticky="ew")
 
@@ -353,12 +342,7 @@ class MainView:
             text="In Progress",
             command=lambda: self.filter_tasks("active"),
             bg=COLORS["secondary"],
-            fg=COLORS["text"],
-            font=("Arial", 10),
-            relief=tk.FLAT,
-            borderwidth=2,
-            padx=5,
-            pady=5
+            fg=COLORS["text"]
         )
         self.active_button.grid(row=0, column=1, padx=2, pady=5, sticky="ew")
 
@@ -367,14 +351,16 @@ class MainView:
             text="Completed",
             command=lambda: self.filter_tasks("finished"),
             bg=COLORS["secondary"],
-            fg=COLORS["text"],
-            font=("Arial", 10),
-            relief=tk.FLAT,
-            borderwidth=2,
-            padx=5,
-            pady=5
+            fg=COLORS["text"]
         )
         self.finished_button.grid(row=0, column=2, padx=2, pady=5, sticky="ew")
+        
+        # Filter name to button, used to highlight the selected filter
+        self._filter_buttons = {
+            "all": self.all_button,
+            "active": self.active_button,
+            "finished": self.finished_button
+        }
 
         # History text widget with custom styling
         self.history_text = tk.Text(
@@ -408,10 +394,9 @@ class MainView:
         status_frame = tk.Frame(self.root, bg=COLORS["sidebar"], padx=5, pady=3)
         status_frame.grid(row=2, column=0, sticky="ew")  # Stick to east-west
         
-        status_text = f"Task Logger {VERSION} • Last updated: {datetime.now().strftime('%Y-%m-%d')}"
         status_label = tk.Label(
             status_frame, 
-            text=status_text, 
+            text=STATUS_TEXT, 
             fg=COLORS["sidebar_text"], 
             bg=COLORS["sidebar"],
             font=("Arial", 8)
@@ -448,108 +433,45 @@ class MainView:
         self.current_filter = filter_type
         
         # Update button appearances based on active filter
-        self.all_button.config(
-            bg=COLORS["primary"] if filter_type == "all" else COLORS["secondary"],
-            fg=COLORS["background"] if filter_type == "all" else COLORS["text"]
-        )
-        
-        self.active_button.config(
-            bg=COLORS["primary"] if filter_type == "active" else COLORS["secondary"],
-            fg=COLORS["background"] if filter_type == "active" else COLORS["text"]
-        )
-        
-        self.finished_button.config(
-            bg=COLORS["primary"] if filter_type == "finished" else COLORS["secondary"],
-            fg=COLORS["background"] if filter_type == "finished" else COLORS["text"]
-        )
+        for name, button in self._filter_buttons.items():
+            selected = name == filter_type
+            button.config(
+                bg=COLORS["primary" if selected else "secondary"],
+                fg=COLORS["background" if selected else "text"]
+            )
         
         # Refresh the task history with filtered results
+        self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        """Queue a history refresh for when Tk is idle, coalescing repeated requests into one redraw"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.root.after_idle(self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run a queued history refresh"""
+        self._refresh_pending = False
         self.refresh_history()
     
     def refresh_history(self, clear_exports=False):
         """Refresh the task history display directly from the log file."""
+        # Make sure buffered log entries are on disk before reading them back
+        self.task_controller.flush_log()
+        
         self.history_text.config(state="normal")
         self.history_text.delete(1.0, tk.END)
 
         try:
-            log_file_path = "exports/task_history.log"
+            log_file_path = os.path.join(EXPORTS_DIR, "task_history.log")
             if not os.path.exists(log_file_path):
                 self.history_text.insert(tk.END, "No task history available.\n")
                 self.history_text.config(state="disabled")
                 return
 
-            entries = []
-            with open(log_file_path, "r", encoding="utf-8") as log_file:
-                for line in log_file:
-                    if not line.strip() or line.startswith("#"):  # Skip empty lines and headers
-                        continue
-                    
-                    # Parse the log entry
-                    try:
-                        # Format is: emoji timestamp: - status - description
-                        if ":" not in line or " - " not in line:
-                            continue
-
-                        # Split on the colon first to separate emoji+timestamp from the rest
-                        timestamp_part, rest = line.split(" - ", 1)
-                        # Explicitly strip leading/trailing whitespace from timestamp_part
-                        timestamp_part = timestamp_part.strip()
-                        timestamp_str = timestamp_part[1:].strip()  # Extract timestamp after the emoji
-                    
-                        
-                        if " - " not in rest:
-                            continue
-                            
-                       # Split the rest into status and description
-                        parts = rest.strip().split(" - ",1)
-
-                            
-                        status = parts[0].strip()
-                        desc = parts[1].strip()
-                       
-
-                        # Extract emoji and timestamp
-                        emoji = timestamp_part[0]  # First character should be emoji
-                        
-                        
-                        # Determine the entry type and tag based on status
-                        tag = "completed"
-                        if "In Progress" in status:
-                            tag = "active" 
-                        elif "Notes" in status:
-                            tag = "note"                            
-                        elif "Clear Export Dir" in status:
-                            tag = "export"
-                            
-                        print(f"Tag: {tag}")
-                        # Parse the timestamp
-                        try:
-                            # print(f"Timestamp string: {timestamp_str}")
-                            timestamp = pd.to_datetime(timestamp_str.strip())
-                            # print(f"Parsed timestamp: {timestamp}")
-                            # print(f"text: {line.strip()}")
-                            # print (f"tag: {tag}")
-                            # print (f"status: {status}") 
-                            # print (f"desc: {desc}")
-
-                            entries.append({
-                                'timestamp': timestamp,
-                                'text': line.strip(),
-                                'tag': tag,
-                                'status': status,
-                                'desc': desc
-                            })
-                            
-                        except Exception as e:
-                            print(f"Inner parsing timestamp: {e}")
-                            continue
-                    
-                    except Exception as e:
-                        print(f"Error parsing log line: {e}")
-                        continue
-
-            # Sort entries by timestamp (newest first)
-            entries.sort(key=lambda x: x['timestamp'], reverse=True)
+            # Only parse lines appended since the last refresh; entries are kept newest first
+            self._read_new_history(log_file_path)
+            entries = self._history_entries
            
 
             # Filter entries based on current filter
@@ -570,21 +492,27 @@ class MainView:
                         filtered_entries.append(entry)
                     
 
+            # Collect (text, tag) pairs so everything is inserted with a single Tk call
+            segments = []
+            
             # Display count header
             if self.current_filter == "active":
                 active_count = len(filtered_entries)
-                self.history_text.insert(tk.END, f"You have {active_count} active task(s)\n\n", "active")
+                segments += [f"You have {active_count} active task(s)\n\n", "active"]
             elif self.current_filter == "finished":
                 completed_count = len(filtered_entries)
-                self.history_text.insert(tk.END, f"You have {completed_count} finished task(s)\n\n", "completed")
+                segments += [f"You have {completed_count} finished task(s)\n\n", "completed"]
             else:
                 all_count = len(filtered_entries)
                 if all_count > 0:
-                    self.history_text.insert(tk.END, f"You have {all_count} total task(s)\n\n", "active")
+                    segments += [f"You have {all_count} total task(s)\n\n", "active"]
 
             # Display filtered entries
             for entry in filtered_entries:
-                self.history_text.insert(tk.END, entry['text'] + "\n", entry['tag'])
+                segments += [entry['text'] + "\n", entry['tag']]
+            
+            if segments:
+                self.history_text.insert(tk.END, *segments)
 
         except Exception as e:
             import traceback
@@ -594,6 +522,110 @@ class MainView:
 
         self.history_text.config(state="disabled")
 
+    def _read_new_history(self, log_file_path):
+        """
+        Parse history log lines written since the last read into the entry cache
+        
+        Args:
+            log_file_path: Path to the log file
+        """
+        # Start over if the log was replaced or truncated since the last read
+        if os.path.getsize(log_file_path) < self._history_pos:
+            self._history_entries = []
+            self._history_keys = []
+            self._history_pos = 0
+        
+        with open(log_file_path, "r", encoding="utf-8") as log_file:
+            log_file.seek(self._history_pos)
+            new_lines = log_file.read().splitlines(True)
+            self._history_pos = log_file.tell()
+        
+        # Insert each entry at its place in newest-first order (after equal timestamps,
+        # so ties stay in file order) instead of re-sorting everything on every refresh
+        for line in new_lines:
+            entry = self._parse_history_line(line)
+            if entry is not None:
+                key = -entry['timestamp'].value
+                pos = bisect_right(self._history_keys, key)
+                self._history_keys.insert(pos, key)
+                self._history_entries.insert(pos, entry)
+
+    def _parse_history_line(self, line):
+        """
+        Parse one history log line
+        
+        Args:
+            line: Raw line from the log file
+            
+        Returns:
+            Dictionary with timestamp, text, tag, status and desc, or None if the line is not an entry
+        """
+        if not line.strip() or line.startswith("#"):  # Skip empty lines and headers
+            return None
+        
+        # Parse the log entry
+        try:
+            # Format is: emoji timestamp: - status - description
+            if ":" not in line or " - " not in line:
+                return None
+
+            # Split on the colon first to separate emoji+timestamp from the rest
+            timestamp_part, rest = line.split(" - ", 1)
+            # Explicitly strip leading/trailing whitespace from timestamp_part
+            timestamp_part = timestamp_part.strip()
+            timestamp_str = timestamp_part[1:].strip()  # Extract timestamp after the emoji
+        
+            
+            if " - " not in rest:
+                return None
+                
+           # Split the rest into status and description
+            parts = rest.strip().split(" - ",1)
+
+                
+            status = parts[0].strip()
+            desc = parts[1].strip()
+           
+
+            # Extract emoji and timestamp
+            emoji = timestamp_part[0]  # First character should be emoji
+            
+            
+            # Determine the entry type and tag based on status
+            tag = "completed"
+            if "In Progress" in status:
+                tag = "active" 
+            elif "Notes" in status:
+                tag = "note"                            
+            elif "Clear Export Dir" in status:
+                tag = "export"
+                
+            # Parse the timestamp
+            try:
+                # print(f"Timestamp string: {timestamp_str}")
+                timestamp = pd.to_datetime(timestamp_str.strip())
+                # print(f"Parsed timestamp: {timestamp}")
+                # print(f"text: {line.strip()}")
+                # print (f"tag: {tag}")
+                # print (f"status: {status}") 
+                # print (f"desc: {desc}")
+
+                return {
+                    'timestamp': timestamp,
+                    'text': line.strip(),
+                    'tag': tag,
+                    'status': status,
+                    'desc': desc
+                }
+                
+            except Exception as e:
+                print(f"Inner parsing timestamp: {e}")
+                return None
+        
+        except Exception as e:
+            print(f"Error parsing log line: {e}")
+            return None
+
     def _create_initial_log(self, log_file_path, df, format_func):
         """Create the initial log file from existing data if it does not already exist."""
         try:
@@ -602,9 +634,9 @@ class MainView:
                 print(f"Log file already exists at {log_file_path}. Skipping initial log creation.")
                 return  # Exit the function if the file exists
 
-            # Ensure relevant columns are converted to datetime
+            # Ensure relevant columns are converted to datetime (the model normally has already)
             for col in ["Start Time", "Stop Time", "Updated"]:
-                if col in df.columns:
+                if col in df.columns and not is_datetime64_any_dtype(df[col]):
                     df[col] = pd.to_datetime(df[col], errors="coerce")
 
             # Create the log file
@@ -616,7 +648,7 @@ class MainView:
                 events = []
                 
                 # Process active tasks (start times)
-                active_tasks = df[df["Active"] == 1].copy()
+                active_tasks = df.iloc[np.flatnonzero(df["Active"].to_numpy() == 1)]
                 for _, row in active_tasks.iterrows():
                     if row["Task Description"] != "Clear exports folder":  # Skip clear exports entries here
                         events.append({
@@ -629,7 +661,7 @@ class MainView:
                         })
                 
                 # Process completed tasks
-                completed_tasks = df[df["Active"] == 0].copy()
+                completed_tasks = df.iloc[np.flatnonzero(df["Active"].to_numpy() == 0)]
                 for _, row in completed_tasks.iterrows():
                     if row["Task Description"] == "Clear exports folder":
                         # Handle clear exports entries
@@ -664,7 +696,7 @@ class MainView:
                             })
                 
                 # Process note updates
-                note_updates = df[pd.notna(df["Updated"])].copy()
+                note_updates = df.iloc[np.flatnonzero(pd.notna(df["Updated"].to_numpy()))]
                 for _, row in note_updates.iterrows():
                     if row["Task Description"] != "Clear exports folder":  # Skip clear exports entries here
                         events.append({
@@ -717,35 +749,22 @@ class MainView:
 
     def _show_start_task_dialog(self):
         """Show dialog to start a new task"""
-        self.dialog_factory.create_start_task_dialog(self.refresh_history)
+        self.dialog_factory.create_start_task_dialog(self._schedule_refresh)
     
-    # def function that clears out the exports folder of HTML files
+    # def function that clears out the HTML preview files
     def _clear_exports_folder(self):
-        """Clear the exports folder of HTML files and log the action."""
-        exports_folder = "exports"
-        if os.path.exists(exports_folder):
-            cleared_files = False
-            for filename in os.listdir(exports_folder):
-                if filename.endswith(".html"):
-                    file_path = os.path.join(exports_folder, filename)
-                    try:
-                        os.remove(file_path)
-                        cleared_files = True
-                        print(f"Deleted {file_path}")
-                    except Exception as e:
-                        print(f"Error deleting {file_path}: {e}")
-            
-            if cleared_files:
-                # Log the action of clearing the exports folder
-                self.log_exports_clear()
-                messagebox.showinfo("Success", "Exports folder cleared.")
-            else:
-                messagebox.showinfo("Info", "No HTML files found to clear in the exports folder.")
+        """Delete the HTML preview files and log the action."""
+        # Previews are written to the temp folder; the controller also removes
+        # any HTML older versions left in the exports folder
+        if self.report_controller.clear_previews():
+            # Log the action of clearing the previews
+            self.log_exports_clear()
+            messagebox.showinfo("Success", "Preview files cleared.")
         else:
-            messagebox.showwarning("Warning", "Exports folder does not exist.")
+            messagebox.showinfo("Info", "No HTML preview files found to clear.")
         
         # Refresh the history to include the log entry
-        self.refresh_history(True)
+        self._schedule_refresh()
 
     def _show_tasks_window(self, task_type="active"):
         """Open a new window to manage active tasks."""
@@ -769,11 +788,14 @@ class MainView:
         # Bind double-click event to the listbox
         task_listbox.bind("<Double-1>", lambda event: self._handle_task_listbox_double_click(event, task_listbox))
 
-        # Populate the listbox with tasks
-        for start_date, task_description in tasks:
-            ## format start_date to be MM/DD/YYYY HH:MM AM/PM
-            start_date = pd.to_datetime(start_date).strftime("%m/%d/%Y %I:%M %p")
-            task_listbox.insert(tk.END, f"[{start_date}] - {task_description}")
+        # Populate the listbox with tasks, formatting every start date as
+        # MM/DD/YYYY HH:MM AM/PM in one vectorized call
+        start_dates = pd.DatetimeIndex([start_date for start_date, _ in tasks])
+        start_labels = start_dates.strftime("%m/%d/%Y %I:%M %p").fillna("No timestamp")
+        task_listbox.insert(tk.END, *[
+            f"[{start_label}] - {task_description}"
+            for start_label, (_, task_description) in zip(start_labels.tolist(), tasks)
+        ])
 
         def close_selected_tasks():
             selected_indices = task_listbox.curselection()
@@ -787,7 +809,7 @@ class MainView:
                 self.task_controller.finish_task(task, note or "")
                 messagebox.showinfo("Success", "Selected tasks have been closed.")
             # dialog.destroy()
-            self.refresh_history()
+            self._schedule_refresh()
 
         def add_notes_to_selected_tasks():
             selected_indices = task_listbox.curselection()
@@ -803,10 +825,10 @@ class MainView:
                 note = simpledialog.askstring("Add Note", f"Enter a note for task: {task_description}")
                 if note:
                     # Get tasks matching just the description part
-                    matching_tasks = self.task_controller.model.get_tasks(task_description=task_description)
+                    matching_indices = self.task_controller.model.get_indices(task_description)
                     
-                    if not matching_tasks.empty:
-                        for idx in matching_tasks.index:
+                    if matching_indices:
+                        for idx in matching_indices:
                             # Pass the current timestamp to update the "Updated" field
                             current_time = datetime.now()
                             self.task_controller.update_task_notes(task_description, note, current_time)
@@ -816,7 +838,7 @@ class MainView:
                             messagebox.showinfo("Success", "Notes have been added to the selected tasks.")
             # dialog.destroy()
             # Remove notes_only=True to show the full history
-            self.refresh_history()
+            self._schedule_refresh()
 
         # Button frame
         button_frame = tk.Frame(content, bg=COLORS["background"])